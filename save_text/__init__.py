@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, Union
+import os
+from collections.abc import Iterable
 
 __all__ = ["save_text", "save_text_lines"]
 
-PathLike = Union[str, Path]
+# ``pathlib`` and ``typing`` are only imported when needed so that the CLI
+# client can hand a request to a running daemon without paying for them. At
+# runtime ``PathLike`` is kept as a string annotation; resolving the hints with
+# ``typing.get_type_hints`` needs ``localns={"Path": pathlib.Path}``.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Union
+
+    PathLike = Union[str, Path]
+else:
+    PathLike = "str | os.PathLike[str]"
 
 
 def _prepare_path(path: PathLike) -> Path:
+    from pathlib import Path
+
     path = Path(path)
     if path.parent != Path():
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -1,17 +1,49 @@
-"""Command line interface for :mod:`save_text`."""
+"""Command line interface for :mod:`save_text`.
+
+When a ``save-text --daemon`` process is listening on the socket returned by
+:func:`_socket_path`, the raw arguments are forwarded to it and the write happens
+in that warm process. Otherwise the arguments are parsed and written here.
+``argparse`` and ``pathlib`` are only imported on that fallback path.
+"""
 
 from __future__ import annotations
 
-import argparse
+import os
+import socket
+import stat
 import sys
-from pathlib import Path
-from typing import Iterable
+from collections.abc import Callable, Iterable
 
 from . import save_text, save_text_lines
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from typing import TextIO
+
+SOCKET_ENV = "SAVE_TEXT_SOCKET"
+_CHUNK_SIZE = 64 * 1024
+# Upper bounds the daemon accepts for the request frame (umask, cwd and argv)
+# and for each stdin frame, which holds _CHUNK_SIZE characters of UTF-8.
+_MAX_REQUEST_SIZE = 8 * 1024 * 1024
+_MAX_STDIN_FRAME_SIZE = 4 * _CHUNK_SIZE
+_ENCODING = "utf-8"
+_ERRORS = "surrogateescape"
+# Seconds to wait for a daemon to accept and acknowledge a request before
+# writing in-process instead.
+_REPLY_TIMEOUT = 2.0
+
 
 def _parse_args(argv: Iterable[str]) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Save text content to a file")
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(
+        description="Save text content to a file",
+        epilog="Run 'save-text --daemon' to keep a resident writer process listening on "
+        f"${SOCKET_ENV} (default: $XDG_RUNTIME_DIR/save-text.sock); later calls hand "
+        "their writes to it. Files are still created under the caller's umask.",
+    )
     parser.add_argument("path", type=Path, help="Destination file path")
     parser.add_argument(
         "content",
@@ -55,23 +87,30 @@ def _parse_args(argv: Iterable[str]) -> argparse.Namespace:
     return args
 
 
-def main(argv: Iterable[str] | None = None) -> int:
-    args = _parse_args(sys.argv[1:] if argv is None else argv)
+def _parse_daemon_args(argv: Iterable[str]) -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="save-text --daemon",
+        description=f"Serve save-text writes from a resident process listening on ${SOCKET_ENV} "
+        "(default: $XDG_RUNTIME_DIR/save-text.sock).",
+    )
+    parser.add_argument("--daemon", action="store_true", required=True, help=argparse.SUPPRESS)
+    return parser.parse_args(list(argv))
+
 
-    content: Iterable[str]
+def _write(args: argparse.Namespace, read_stdin: Callable[[], str]) -> None:
     if args.stdin:
-        content_text = sys.stdin.read()
         save_text(
-            content_text,
+            read_stdin(),
             args.path,
             encoding=args.encoding,
             append=args.append,
             ensure_trailing_newline=not args.no_trailing_newline,
         )
     else:
-        content = args.content
         save_text_lines(
-            content,
+            args.content,
             args.path,
             encoding=args.encoding,
             append=args.append,
@@ -79,6 +118,122 @@ def main(argv: Iterable[str] | None = None) -> int:
             ensure_trailing_newline=not args.no_trailing_newline,
         )
 
+
+# -- Daemon client ----------------------------------------------------------
+def _socket_path() -> str:
+    configured = os.environ.get(SOCKET_ENV)
+    if configured:
+        return configured
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "save-text.sock")
+    temp_dir = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(temp_dir, f"save-text-{os.getuid()}", "save-text.sock")
+
+
+def _is_private_directory(path: str) -> bool:
+    """Return whether only we (or root) can replace entries in directory *path*."""
+
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if info.st_uid not in (0, os.getuid()):
+        return False
+    return not info.st_mode & 0o022 or bool(info.st_mode & stat.S_ISVTX)
+
+
+def _is_trusted_socket(path: str) -> bool:
+    """Return whether *path* is a socket we own in a directory nobody else controls."""
+
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        return False
+    return _is_private_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def _frame(data: bytes) -> bytes:
+    return b"%d\n" % len(data) + data
+
+
+def _submit(argv: list[str], stdin: TextIO) -> int | None:
+    """Hand *argv* to a running daemon and return its exit status.
+
+    ``None`` means the request was not handed over: no trusted daemon is
+    listening, it did not answer within :data:`_REPLY_TIMEOUT`, or it could not
+    parse the arguments. The caller then handles the request itself. The
+    daemon only writes after the final empty frame, so once that (or any
+    stdin) has been sent, failures are reported rather than retried and an
+    append is never applied twice.
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    umask = os.umask(0)
+    os.umask(umask)
+    try:
+        payload = "\0".join([f"{umask:o}", os.getcwd(), *argv]).encode(_ENCODING, _ERRORS)
+    except OSError:
+        return None
+
+    path = _socket_path()
+    if not _is_trusted_socket(path):
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(_REPLY_TIMEOUT)
+    try:
+        try:
+            client.connect(path)
+            client.sendall(_frame(payload))
+            replies = client.makefile("rb")
+            reply = replies.readline()
+            if reply not in (b"ready\n", b"stdin\n"):
+                return None
+            if reply == b"ready\n":
+                client.sendall(_frame(b""))
+        except OSError:
+            return None
+
+        try:
+            client.settimeout(None)
+            if reply == b"stdin\n":
+                while chunk := stdin.read(_CHUNK_SIZE):
+                    client.sendall(_frame(chunk.encode(_ENCODING, _ERRORS)))
+                client.sendall(_frame(b""))
+            reply = replies.readline()
+        except OSError as exc:
+            reply = b"error lost connection to daemon: " + str(exc).encode()
+    finally:
+        client.close()
+
+    if reply == b"ok\n":
+        return 0
+    message = reply.removeprefix(b"error ").decode(_ENCODING, "replace").strip()
+    print(f"save-text: error: {message or 'no reply from daemon'}", file=sys.stderr)
+    return 1
+
+
+def main(argv: Iterable[str] | None = None) -> int:
+    arguments = list(sys.argv[1:] if argv is None else argv)
+
+    separator = arguments.index("--") if "--" in arguments else len(arguments)
+    if "--daemon" in arguments[:separator]:
+        _parse_daemon_args(arguments)
+        from .daemon import serve
+
+        return serve()
+
+    status = _submit(arguments, sys.stdin)
+    if status is not None:
+        return status
+
+    args = _parse_args(arguments)
+    _write(args, sys.stdin.read)
     return 0
 
 
@@ -0,0 +1,200 @@
+"""Resident writer process behind ``save-text --daemon``.
+
+The daemon listens on a Unix domain socket and performs writes on behalf of
+:func:`save_text.cli.main`, so that shell pipelines calling ``save-text`` many
+times only pay for interpreter startup once.
+
+Every message from the client is a frame: a decimal byte count, a newline and
+that many bytes. The first frame holds the client's umask in octal, its working
+directory and its command line arguments, separated by NUL bytes. Frames
+larger than the limits in :mod:`save_text.cli` are rejected. The daemon answers
+with a line:
+
+``usage``
+    The arguments did not parse; the client falls back to handling them itself
+    so that usage errors and ``--help`` are printed as usual.
+``stdin``
+    The client streams its standard input as further frames.
+``ready``
+    No further input is needed.
+
+The client then sends an empty frame, and only after receiving it does the
+daemon write and answer ``ok`` or ``error <message>``. A connection that closes
+before the empty frame is dropped without writing anything.
+
+Requests are served concurrently, but the writes themselves happen one at a
+time: the process umask is switched to the client's for each write, so files
+and directories get the same modes as an in-process write would give them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .cli import (
+    _ENCODING,
+    _ERRORS,
+    _MAX_REQUEST_SIZE,
+    _MAX_STDIN_FRAME_SIZE,
+    _is_private_directory,
+    _parse_args,
+    _socket_path,
+    _write,
+)
+
+# ``contextlib.redirect_*`` and ``os.umask`` change process-wide state, so
+# only one handler thread may parse arguments, and one may write, at a time.
+_PARSE_LOCK = threading.Lock()
+_WRITE_LOCK = threading.Lock()
+
+
+class WriteRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        payload = self._read_frame(_MAX_REQUEST_SIZE)
+        if payload is None:
+            return
+        try:
+            umask, cwd, *argv = payload.decode(_ENCODING, _ERRORS).split("\0")
+            umask = int(umask, 8)
+        except ValueError:
+            return
+
+        try:
+            with _PARSE_LOCK, contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+                io.StringIO()
+            ):
+                args = _parse_args(argv)
+        except SystemExit:
+            self._reply("usage")
+            return
+
+        args.path = Path(cwd) / args.path
+        self._reply("stdin" if args.stdin else "ready")
+
+        chunks = []
+        while (chunk := self._read_frame(_MAX_STDIN_FRAME_SIZE)) != b"":
+            if chunk is None:
+                return
+            chunks.append(chunk)
+        text = b"".join(chunks).decode(_ENCODING, _ERRORS)
+
+        try:
+            with _WRITE_LOCK:
+                previous = os.umask(umask & 0o777)
+                try:
+                    _write(args, lambda: text)
+                finally:
+                    os.umask(previous)
+        except Exception as exc:  # reported to the client instead of killing the daemon
+            message = " ".join(str(exc).split()) or type(exc).__name__
+            self._reply(f"error {message}")
+        else:
+            self._reply("ok")
+
+    def _read_frame(self, limit: int) -> Optional[bytes]:
+        """Return the next frame, or ``None`` if the client went away or sent garbage.
+
+        Frames longer than *limit* bytes count as garbage.
+        """
+
+        header = self.rfile.readline(len(str(limit)) + 1)
+        try:
+            length = int(header)
+        except ValueError:
+            return None
+        if not 0 <= length <= limit:
+            return None
+        data = self.rfile.read(length)
+        return data if len(data) == length else None
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode(_ENCODING, _ERRORS) + b"\n")
+        self.wfile.flush()
+
+
+class WriterServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve each client in its own thread."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def server_bind(self) -> None:
+        with _WRITE_LOCK:
+            previous = os.umask(0o177)
+            try:
+                super().server_bind()
+            finally:
+                os.umask(previous)
+
+
+def create_server(path: Optional[str] = None) -> WriterServer:
+    """Bind a :class:`WriterServer` to *path*, replacing a stale socket file.
+
+    The parent directory is created with mode ``0700`` if missing. Raises
+    :class:`RuntimeError` if the directory could be tampered with by another
+    user, if *path* is something other than a socket we own, or if another
+    daemon is already listening there.
+    """
+
+    path = path or _socket_path()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _is_private_directory(directory):
+        raise RuntimeError(f"Refusing to listen in {directory}: other users can replace files there")
+
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        pass
+    else:
+        if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+            raise RuntimeError(f"Refusing to replace {path}: not a socket owned by this user")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"A save-text daemon is already listening on {path}")
+        finally:
+            probe.close()
+    return WriterServer(path, WriteRequestHandler)
+
+
+def serve(path: Optional[str] = None) -> int:
+    """Run the daemon in the foreground until interrupted or terminated."""
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("save-text: error: --daemon requires Unix domain sockets", file=sys.stderr)
+        return 1
+
+    try:
+        server = create_server(path)
+    except (OSError, RuntimeError) as exc:
+        print(f"save-text: error: {exc}", file=sys.stderr)
+        return 1
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Listening on {server.server_address}", file=sys.stderr)
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(server.server_address)
+    return 0
+
+
+__all__ = ["WriteRequestHandler", "WriterServer", "create_server", "serve"]
@@ -0,0 +1,301 @@
+"""Bulk import and streaming export for the paste database."""
+
+from __future__ import annotations
+
+import io
+import json
+import re
+import secrets
+import sqlite3
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+from .web import SaveTextApp, _build_preview
+
+BATCH_SIZE = 10_000
+PASTE_SUFFIX = ".txt"
+SLUG_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+@dataclass
+class PasteRecord:
+    slug: str
+    content: str
+    created_at: str
+
+
+class Progress:
+    """Report processed row counts and throughput to *stream*.
+
+    Updates rewrite a single line; :meth:`finish` ends it with the final count
+    and :meth:`abort` ends it without a summary.
+    """
+
+    def __init__(self, verb: str, stream: Optional[TextIO] = None):
+        self.verb = verb
+        self.stream = stream
+        self.count = 0
+        self._started = time.perf_counter()
+        self._reported: Optional[int] = None
+        self._line_open = False
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self._started
+        return self.count / elapsed if elapsed > 0 else float(self.count)
+
+    def advance(self, rows: int) -> None:
+        self.count += rows
+        if rows:
+            self._report()
+
+    def finish(self) -> None:
+        if self._reported != self.count:
+            self._report()
+        self._end_line()
+
+    def abort(self) -> None:
+        self._end_line()
+
+    def _report(self) -> None:
+        self._reported = self.count
+        if self.stream is None:
+            return
+        self.stream.write(f"\r{self.verb} {self.count} pastes ({self.rate:,.0f} rows/s)")
+        self.stream.flush()
+        self._line_open = True
+
+    def _end_line(self) -> None:
+        if self.stream is not None and self._line_open:
+            self.stream.write("\n")
+            self.stream.flush()
+            self._line_open = False
+
+
+# -- Import -------------------------------------------------------------
+def import_pastes(
+    database_path: Path,
+    source: Path,
+    *,
+    batch_size: int = BATCH_SIZE,
+    workers: Optional[int] = None,
+    progress: Optional[TextIO] = None,
+) -> int:
+    """Insert every paste found in *source* into *database_path*.
+
+    *source* may be a directory of ``<slug>.txt`` files, a tar archive with the
+    same layout, or a JSONL file with ``slug``, ``content`` and ``created_at``
+    keys. Rows are inserted in batches of *batch_size*, one transaction per
+    batch, with previews computed in a process pool. Pastes whose slug already
+    exists are skipped. Returns the number of pastes inserted.
+
+    Raises :class:`ValueError` when *source* is not a supported format or holds
+    a malformed record; batches committed before that point are kept.
+    """
+
+    SaveTextApp(database_path)
+    reporter = Progress("Imported", progress)
+    connection = sqlite3.connect(database_path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA synchronous = OFF")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch in _batched(_read_records(Path(source)), batch_size):
+                previews = executor.map(
+                    _build_preview,
+                    [record.content for record in batch],
+                    chunksize=max(1, len(batch) // 64),
+                )
+                rows = [
+                    (record.slug, record.content, preview, record.created_at)
+                    for record, preview in zip(batch, previews)
+                ]
+                before = connection.total_changes
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT OR IGNORE INTO paste (slug, content, preview, created_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute("COMMIT")
+                reporter.advance(connection.total_changes - before)
+    except BaseException:
+        reporter.abort()
+        raise
+    finally:
+        connection.close()
+    reporter.finish()
+    return reporter.count
+
+
+def _read_records(source: Path) -> Iterator[PasteRecord]:
+    if source.is_dir():
+        return _read_directory(source)
+    if source.suffix == ".jsonl":
+        return _read_jsonl(source)
+    if tarfile.is_tarfile(source):
+        return _read_tar(source)
+    raise ValueError(f"Unsupported import source: {source}")
+
+
+def _read_directory(source: Path) -> Iterator[PasteRecord]:
+    for path in sorted(source.glob(f"*{PASTE_SUFFIX}")):
+        yield PasteRecord(
+            slug=_validate_slug(path.stem, path),
+            content=path.read_text(encoding="utf-8"),
+            created_at=_format_timestamp(path.stat().st_mtime),
+        )
+
+
+def _read_tar(source: Path) -> Iterator[PasteRecord]:
+    with tarfile.open(source, "r|*") as archive:
+        for member in archive:
+            # Archives built with ``tar -C dump .`` prefix every member with "./".
+            name = member.name.removeprefix("./")
+            if not member.isfile() or not name.endswith(PASTE_SUFFIX):
+                continue
+            handle = archive.extractfile(member)
+            if handle is None:
+                continue
+            yield PasteRecord(
+                slug=_validate_slug(name.removesuffix(PASTE_SUFFIX), f"{source}:{member.name}"),
+                content=handle.read().decode("utf-8"),
+                created_at=_format_timestamp(member.mtime),
+            )
+
+
+def _read_jsonl(source: Path) -> Iterator[PasteRecord]:
+    with source.open(encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            origin = f"{source}:{number}"
+            try:
+                data = json.loads(line)
+                content = data["content"]
+                created_at = data.get("created_at")
+                moment = datetime.fromisoformat(created_at) if created_at else datetime.utcnow()
+            except (ValueError, TypeError, KeyError, AttributeError) as exc:
+                raise ValueError(f"Malformed paste record at {origin}: {exc}") from None
+            if not isinstance(content, str):
+                raise ValueError(f"Malformed paste record at {origin}: content must be a string")
+            if moment.tzinfo is not None:
+                moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            yield PasteRecord(
+                slug=_validate_slug(data.get("slug") or secrets.token_urlsafe(6), origin),
+                content=content,
+                created_at=moment.isoformat(timespec="seconds"),
+            )
+
+
+# -- Export -------------------------------------------------------------
+def export_pastes(
+    database_path: Path,
+    destination: Path,
+    *,
+    progress: Optional[TextIO] = None,
+) -> int:
+    """Stream every paste in *database_path* into *destination*.
+
+    A ``.jsonl`` destination receives one JSON object per paste; anything else
+    is written as a tar archive of ``<slug>.txt`` members (compressed when the
+    suffix asks for it). Rows are read from the cursor one at a time, so the
+    table is never loaded into memory. Returns the number of pastes exported.
+    """
+
+    if not Path(database_path).exists():
+        raise FileNotFoundError(f"No paste database at {database_path}")
+
+    destination = Path(destination)
+    reporter = Progress("Exported", progress)
+    connection = sqlite3.connect(database_path)
+    try:
+        records = (
+            PasteRecord(slug=slug, content=content, created_at=created_at)
+            for slug, content, created_at in connection.execute(
+                "SELECT slug, content, created_at FROM paste ORDER BY id"
+            )
+        )
+        if destination.suffix == ".jsonl":
+            _write_jsonl(records, destination, reporter)
+        else:
+            _write_tar(records, destination, reporter)
+    except BaseException:
+        reporter.abort()
+        raise
+    finally:
+        connection.close()
+    reporter.finish()
+    return reporter.count
+
+
+def _write_jsonl(records: Iterable[PasteRecord], destination: Path, reporter: Progress) -> None:
+    with destination.open("w", encoding="utf-8") as handle:
+        pending = 0
+        for record in records:
+            handle.write(
+                json.dumps(
+                    {"slug": record.slug, "content": record.content, "created_at": record.created_at},
+                    ensure_ascii=False,
+                )
+            )
+            handle.write("\n")
+            pending += 1
+            if pending == BATCH_SIZE:
+                reporter.advance(pending)
+                pending = 0
+        reporter.advance(pending)
+
+
+def _write_tar(records: Iterable[PasteRecord], destination: Path, reporter: Progress) -> None:
+    with tarfile.open(destination, _tar_write_mode(destination)) as archive:
+        pending = 0
+        for record in records:
+            data = record.content.encode("utf-8")
+            member = tarfile.TarInfo(f"{record.slug}{PASTE_SUFFIX}")
+            member.size = len(data)
+            member.mtime = int(
+                datetime.fromisoformat(record.created_at).replace(tzinfo=timezone.utc).timestamp()
+            )
+            archive.addfile(member, io.BytesIO(data))
+            pending += 1
+            if pending == BATCH_SIZE:
+                reporter.advance(pending)
+                pending = 0
+        reporter.advance(pending)
+
+
+def _tar_write_mode(destination: Path) -> str:
+    name = destination.name
+    if name.endswith((".tar.gz", ".tgz")):
+        return "w:gz"
+    if name.endswith((".tar.bz2", ".tbz2")):
+        return "w:bz2"
+    if name.endswith((".tar.xz", ".txz")):
+        return "w:xz"
+    return "w"
+
+
+# -- Utilities ----------------------------------------------------------
+def _batched(records: Iterable[PasteRecord], size: int) -> Iterator[list[PasteRecord]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _validate_slug(slug: object, origin: object) -> str:
+    if not isinstance(slug, str) or not SLUG_PATTERN.fullmatch(slug):
+        raise ValueError(f"Invalid slug {slug!r} at {origin}: use letters, digits, '-' and '_' only")
+    return slug
+
+
+def _format_timestamp(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.replace(tzinfo=None).isoformat(timespec="seconds")
+
+
+__all__ = ["PasteRecord", "Progress", "export_pastes", "import_pastes"]
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import argparse
 import html
 import secrets
 import sqlite3
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from io import BytesIO
@@ -20,10 +22,82 @@ def create_app(database_path: Optional[Path] = None) -> "SaveTextApp":
     return SaveTextApp(database_path or DEFAULT_DATABASE)
 
 
-def main() -> None:
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def _parse_args(argv: Iterable[str]) -> argparse.Namespace:
+    from .transfer import BATCH_SIZE
+
+    parser = argparse.ArgumentParser(description="Run the Save Text paste service")
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=DEFAULT_DATABASE,
+        help="SQLite database holding the pastes (default: %(default)s).",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    import_parser = commands.add_parser(
+        "import",
+        help="Bulk insert pastes from a directory, tar archive or JSONL file.",
+    )
+    import_parser.add_argument("source", type=Path, help="Directory, tar archive or .jsonl file")
+    import_parser.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=BATCH_SIZE,
+        help="Rows inserted per transaction (default: %(default)s).",
+    )
+    import_parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Processes used to compute previews (default: CPU count).",
+    )
+
+    export_parser = commands.add_parser(
+        "export",
+        help="Stream every paste into a tar archive or JSONL file.",
+    )
+    export_parser.add_argument("destination", type=Path, help="Tar archive or .jsonl file to write")
+
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.command in ("import", "export"):
+        import tarfile
+
+        from .transfer import export_pastes, import_pastes
+
+        try:
+            if args.command == "import":
+                import_pastes(
+                    args.database,
+                    args.source,
+                    batch_size=args.batch_size,
+                    workers=args.workers,
+                    progress=sys.stderr,
+                )
+            else:
+                export_pastes(args.database, args.destination, progress=sys.stderr)
+        except (OSError, ValueError, sqlite3.Error, tarfile.TarError) as exc:
+            print(f"save-text-web: error: {exc}", file=sys.stderr)
+            raise SystemExit(1) from None
+        return
+
     from wsgiref.simple_server import make_server
 
-    app = create_app()
+    app = create_app(args.database)
     host = "0.0.0.0"
     port = 8000
     with make_server(host, port, app) as server:
@@ -3,6 +3,15 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _no_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep a save-text daemon running on the host from handling test writes."""
+
+    monkeypatch.setenv("SAVE_TEXT_SOCKET", str(tmp_path / "missing.sock"))
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import io
+import socket
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from save_text import cli
+from save_text.cli import _submit, main as cli_main
+from save_text.daemon import WriteRequestHandler, WriterServer, create_server
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets")
+
+
+def read(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+class BlockingStdin(io.StringIO):
+    """Standard input that produces nothing until :attr:`release` is set."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.release = threading.Event()
+
+    def read(self, size: int | None = -1) -> str:
+        self.release.wait(timeout=10)
+        return super().read(size)
+
+
+@pytest.fixture()
+def daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[WriterServer]:
+    socket_path = tmp_path / "save-text.sock"
+    monkeypatch.setenv("SAVE_TEXT_SOCKET", str(socket_path))
+    server = create_server(str(socket_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_submit_without_daemon_returns_none(tmp_path: Path):
+    assert _submit([str(tmp_path / "out.txt"), "hello"], io.StringIO()) is None
+
+
+def test_daemon_writes_relative_to_client_cwd(
+    daemon: WriterServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.chdir(tmp_path)
+    assert _submit(["nested/out.txt", "hello", "world"], io.StringIO()) == 0
+    assert read(tmp_path / "nested" / "out.txt") == "hello\nworld\n"
+
+    assert _submit(["--append", "nested/out.txt", "again"], io.StringIO()) == 0
+    assert read(tmp_path / "nested" / "out.txt") == "hello\nworld\nagain\n"
+
+
+def test_daemon_streams_stdin(daemon: WriterServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "stdin.txt"
+    monkeypatch.setattr("sys.stdin", io.StringIO("line\n" * 50_000 + "end"))
+    assert cli_main([str(path), "--stdin"]) == 0
+    assert read(path) == "line\n" * 50_000 + "end\n"
+
+
+def test_daemon_reports_write_errors(daemon: WriterServer, tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    path = tmp_path / "out.txt"
+    assert cli_main(["--encoding", "no-such-codec", str(path), "hello"]) == 1
+    assert "unknown encoding" in capsys.readouterr().err
+
+
+def test_usage_errors_fall_back_to_local_parsing(daemon: WriterServer):
+    assert _submit(["file.txt"], io.StringIO()) is None
+    with pytest.raises(SystemExit):
+        cli_main(["file.txt"])
+
+
+def test_create_server_refuses_running_daemon(daemon: WriterServer):
+    with pytest.raises(RuntimeError):
+        create_server(daemon.server_address)
+
+
+def test_daemon_serves_other_clients_while_stdin_streams(daemon: WriterServer, tmp_path: Path):
+    stdin = BlockingStdin("streamed")
+    results: list[int | None] = []
+    streaming = threading.Thread(
+        target=lambda: results.append(_submit([str(tmp_path / "a.txt"), "--stdin"], stdin))
+    )
+    streaming.start()
+    try:
+        assert _submit([str(tmp_path / "b.txt"), "other"], io.StringIO()) == 0
+        assert _submit([str(tmp_path / "a.txt"), "same file"], io.StringIO()) == 0
+        assert read(tmp_path / "b.txt") == "other\n"
+    finally:
+        stdin.release.set()
+        streaming.join()
+    assert results == [0]
+    assert read(tmp_path / "a.txt") == "streamed\n"
+
+
+def test_unresponsive_daemon_falls_back(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    socket_path = tmp_path / "silent.sock"
+    monkeypatch.setenv("SAVE_TEXT_SOCKET", str(socket_path))
+    monkeypatch.setattr(cli, "_REPLY_TIMEOUT", 0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        listener.listen()
+        assert _submit([str(tmp_path / "out.txt"), "hello"], io.StringIO()) is None
+        assert cli_main([str(tmp_path / "out.txt"), "hello"]) == 0
+    assert read(tmp_path / "out.txt") == "hello\n"
+
+
+def test_untrusted_socket_paths_are_ignored(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    impostor = tmp_path / "impostor.sock"
+    impostor.write_text("not a socket", encoding="utf-8")
+    monkeypatch.setenv("SAVE_TEXT_SOCKET", str(impostor))
+    assert _submit([str(tmp_path / "out.txt"), "hello"], io.StringIO()) is None
+    with pytest.raises(RuntimeError, match="Refusing to replace"):
+        create_server(str(impostor))
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(RuntimeError, match="other users"):
+        create_server(str(shared / "save-text.sock"))
+
+
+def test_deleted_working_directory_falls_back(daemon: WriterServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    gone = tmp_path / "gone"
+    gone.mkdir()
+    monkeypatch.chdir(gone)
+    gone.rmdir()
+    assert _submit([str(tmp_path / "out.txt"), "hello"], io.StringIO()) is None
+
+
+def frame(data: bytes) -> bytes:
+    return b"%d\n" % len(data) + data
+
+
+def test_daemon_applies_client_umask(daemon: WriterServer, tmp_path: Path):
+    path = tmp_path / "private" / "out.txt"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(daemon.server_address)
+        client.sendall(frame(b"\0".join([b"77", str(tmp_path).encode(), str(path).encode(), b"secret"])))
+        replies = client.makefile("rb")
+        assert replies.readline() == b"ready\n"
+        client.sendall(frame(b""))
+        assert replies.readline() == b"ok\n"
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+
+
+@pytest.mark.parametrize(
+    "request_bytes",
+    [
+        b"",
+        b"garbage\n",
+        b"10\nshort",
+        b"99999999999999\n",
+        b"1" * 100,
+        frame(b"not-octal\0/\0out.txt\0x"),
+        frame(b"22\0/\0--stdin\0/dev/null") + b"%d\n" % (cli._MAX_STDIN_FRAME_SIZE + 1),
+    ],
+)
+def test_malformed_requests_close_quietly(daemon: WriterServer, request_bytes: bytes):
+    server_side, client_side = socket.socketpair()
+    with client_side:
+        client_side.sendall(request_bytes)
+        client_side.shutdown(socket.SHUT_WR)
+        with server_side:
+            WriteRequestHandler(server_side, "", daemon)
+        assert client_side.recv(64) in (b"", b"stdin\n")
+
+
+def test_daemon_flag_keeps_path_required(capsys: pytest.CaptureFixture[str]):
+    with pytest.raises(SystemExit):
+        cli_main(["--daemon", "file.txt"])
+    with pytest.raises(SystemExit):
+        cli_main([])
+    assert "path [content ...]" in capsys.readouterr().err
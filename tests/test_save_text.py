@@ -61,6 +61,22 @@ def test_cli_with_stdin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None
     assert read(path) == "hello\nworld\n"
 
 
+def test_cli_writes_literal_daemon_after_separator(tmp_path: Path) -> None:
+    path = tmp_path / "cli.txt"
+    assert cli_main([str(path), "--", "--daemon"]) == 0
+    assert read(path) == "--daemon\n"
+
+
+def test_path_like_alias_is_available_at_runtime() -> None:
+    from typing import get_type_hints
+
+    from save_text import PathLike
+
+    assert PathLike
+    hints = get_type_hints(save_text, localns={"Path": Path})
+    assert hints["return"] is Path
+
+
 @pytest.mark.parametrize(
     "args",
     [
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import io
+import json
+import sqlite3
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from save_text.transfer import export_pastes, import_pastes
+from save_text.web import create_app, main as web_main
+
+
+def fetch_rows(database: Path) -> list[tuple[str, str, str, str]]:
+    with sqlite3.connect(database) as connection:
+        return connection.execute(
+            "SELECT slug, content, preview, created_at FROM paste ORDER BY slug"
+        ).fetchall()
+
+
+def write_jsonl(path: Path, records: list[dict[str, str]]) -> Path:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    return path
+
+
+def test_import_jsonl_computes_previews_and_skips_duplicates(tmp_path: Path):
+    database = tmp_path / "pastes.sqlite3"
+    source = write_jsonl(
+        tmp_path / "pastes.jsonl",
+        [
+            {"slug": "alpha", "content": "first\n\npaste", "created_at": "2024-01-02T03:04:05"},
+            {"slug": "beta", "content": "x" * 200, "created_at": "2024-01-02T03:04:06"},
+            {"slug": "alpha", "content": "duplicate", "created_at": "2024-01-02T03:04:07"},
+        ],
+    )
+
+    assert import_pastes(database, source, batch_size=2, workers=1) == 2
+    assert fetch_rows(database) == [
+        ("alpha", "first\n\npaste", "first paste", "2024-01-02T03:04:05"),
+        ("beta", "x" * 200, "x" * 159 + "…", "2024-01-02T03:04:06"),
+    ]
+
+
+def test_import_directory(tmp_path: Path):
+    source = tmp_path / "dump"
+    source.mkdir()
+    (source / "one.txt").write_text("hello", encoding="utf-8")
+    (source / "ignored.md").write_text("skip me", encoding="utf-8")
+    database = tmp_path / "pastes.sqlite3"
+
+    assert import_pastes(database, source, workers=1) == 1
+    assert [row[:2] for row in fetch_rows(database)] == [("one", "hello")]
+
+
+@pytest.mark.parametrize("name", ["dump.jsonl", "dump.tar", "dump.tar.gz"])
+def test_export_round_trips_through_import(tmp_path: Path, name: str):
+    database = tmp_path / "source.sqlite3"
+    app = create_app(database)
+    app._create_paste("Hello export")
+    app._create_paste("Second paste\nwith lines")
+
+    destination = tmp_path / name
+    assert export_pastes(database, destination) == 2
+
+    copy = tmp_path / "copy.sqlite3"
+    assert import_pastes(copy, destination, workers=1) == 2
+    assert fetch_rows(copy) == fetch_rows(database)
+
+
+def test_cli_export_and_import_report_progress(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    database = tmp_path / "source.sqlite3"
+    create_app(database)._create_paste("via the cli")
+    destination = tmp_path / "dump.tar"
+
+    web_main(["--database", str(database), "export", str(destination)])
+    assert "Exported 1 pastes" in capsys.readouterr().err
+    with tarfile.open(destination) as archive:
+        assert len(archive.getmembers()) == 1
+
+    copy = tmp_path / "copy.sqlite3"
+    web_main(["--database", str(copy), "import", str(destination), "--workers", "1"])
+    assert "Imported 1 pastes" in capsys.readouterr().err
+    assert fetch_rows(copy) == fetch_rows(database)
+
+
+def test_import_progress_counts_inserted_rows(tmp_path: Path):
+    database = tmp_path / "pastes.sqlite3"
+    source = write_jsonl(
+        tmp_path / "pastes.jsonl",
+        [{"slug": "same", "content": "one"}, {"slug": "same", "content": "two"}],
+    )
+    progress = io.StringIO()
+
+    assert import_pastes(database, source, workers=1, progress=progress) == 1
+    assert progress.getvalue().splitlines()[-1].startswith("Imported 1 pastes")
+
+
+def test_import_converts_offsets_to_utc(tmp_path: Path):
+    database = tmp_path / "pastes.sqlite3"
+    source = write_jsonl(
+        tmp_path / "pastes.jsonl",
+        [{"slug": "aware", "content": "x", "created_at": "2024-01-02T03:04:05+02:00"}],
+    )
+
+    import_pastes(database, source, workers=1)
+    assert fetch_rows(database)[0][3] == "2024-01-02T01:04:05"
+
+    destination = tmp_path / "dump.tar"
+    export_pastes(database, destination)
+    with tarfile.open(destination) as archive:
+        assert archive.getmember("aware.txt").mtime == 1704157445
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"slug": "a/b", "content": "nested"},
+        {"slug": "ok"},
+        {"slug": "ok", "content": "x", "created_at": "yesterday"},
+    ],
+)
+def test_import_rejects_malformed_jsonl(tmp_path: Path, record: dict[str, str]):
+    source = write_jsonl(tmp_path / "pastes.jsonl", [record])
+    with pytest.raises(ValueError, match="pastes.jsonl:1"):
+        import_pastes(tmp_path / "pastes.sqlite3", source, workers=1)
+
+
+@pytest.mark.parametrize(
+    "args,message",
+    [
+        (["import", "missing.jsonl"], "No such file"),
+        (["import", "notes.md"], "Unsupported import source"),
+        (["export", "dump.tar"], "No paste database"),
+    ],
+)
+def test_cli_reports_transfer_errors(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    args: list[str],
+    message: str,
+):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "notes.md").write_text("not a paste dump", encoding="utf-8")
+    with pytest.raises(SystemExit) as excinfo:
+        web_main(["--database", "pastes.sqlite3", *args])
+    assert excinfo.value.code == 1
+    assert message in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("option", ["--batch-size", "--workers"])
+@pytest.mark.parametrize("value", ["0", "-5", "many"])
+def test_cli_rejects_non_positive_counts(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], option: str, value: str
+):
+    with pytest.raises(SystemExit) as excinfo:
+        web_main(["--database", str(tmp_path / "db"), "import", str(tmp_path), option, value])
+    assert excinfo.value.code == 2
+    assert "must be a positive integer" in capsys.readouterr().err
+
+
+def test_import_tar_built_with_dot_prefixed_members(tmp_path: Path):
+    dump = tmp_path / "dump"
+    dump.mkdir()
+    (dump / "one.txt").write_text("from tar -C dump .", encoding="utf-8")
+    archive_path = tmp_path / "dump.tar"
+    with tarfile.open(archive_path, "w") as archive:
+        archive.add(dump, arcname=".")
+    database = tmp_path / "pastes.sqlite3"
+
+    assert import_pastes(database, archive_path, workers=1) == 1
+    assert [row[:2] for row in fetch_rows(database)] == [("one", "from tar -C dump .")]
+
+    (dump / "sub").mkdir()
+    (dump / "sub" / "two.txt").write_text("nested", encoding="utf-8")
+    with tarfile.open(archive_path, "w") as archive:
+        archive.add(dump, arcname=".")
+    with pytest.raises(ValueError, match="Invalid slug 'sub/two'"):
+        import_pastes(tmp_path / "other.sqlite3", archive_path, workers=1)
+
+
+def test_progress_reports_final_count_once(tmp_path: Path):
+    database = tmp_path / "pastes.sqlite3"
+    source = write_jsonl(tmp_path / "pastes.jsonl", [{"slug": "one", "content": "x"}])
+    progress = io.StringIO()
+
+    import_pastes(database, source, workers=1, progress=progress)
+    assert progress.getvalue().count("Imported 1 pastes") == 1
+    assert progress.getvalue().endswith(")\n")
+
+
+def test_failed_import_prints_no_summary(tmp_path: Path):
+    source = write_jsonl(tmp_path / "pastes.jsonl", [{"slug": "a/b", "content": "x"}])
+    progress = io.StringIO()
+
+    with pytest.raises(ValueError):
+        import_pastes(tmp_path / "pastes.sqlite3", source, workers=1, progress=progress)
+    assert progress.getvalue() == ""